@@ -2,10 +2,12 @@
 import os
 import re
 import json
+import html
 import time
 import threading
 import signal
 import sys
+import queue
 from typing import List, Set, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
@@ -14,8 +16,10 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 # third
 import requests
 import praw
-from bs4 import BeautifulSoup
-from mutagen.easymp4 import EasyMP4
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+from mutagen.mp4 import MP4
 from rich.console import Console
 from rich.progress import (
     Progress,
@@ -38,44 +42,95 @@ SOUNDGASM_PATTERN = r"https?://soundgasm\.net/u/[\w-]+/[\w-]+"
 REDDIT_POST_PATTERN = r"https?://(?:www\.)?reddit\.com/r/\w+/comments/[\w-]+/[\w-]*"
 DEFAULT_USER_AGENT = "script:soundgasm_downloader:v3.9 (by akrscoi)"
 CONFIG_PATH = "config.json"
+META_CACHE_PATH = "page_cache.json"
+META_CACHE_TTL = 24 * 60 * 60  # seconds a cached page stays valid between runs
 DEFAULT_OUTPUT_FOLDER = "downloads"
-CHUNK_SIZE = 8192
+CHUNK_SIZE = 256 * 1024
+PROGRESS_UPDATE_INTERVAL = 0.1  # seconds between progress bar updates per download
 MAX_WORKERS = 4
+SIZE_PROBE_WORKERS = 10
+PUSHSHIFT_PAGE_SIZE = 1000
+PUSHSHIFT_WORKERS = 4  # profiles queried on pushshift at once
+POOL_SIZE = 20  # connections kept alive per host, enough for every worker pool
+TAG_WORKERS = 2
+TAG_PADDING = 1024  # spare bytes left after the tags so later edits can be made in place
+REQUEST_TIMEOUT = 30  # seconds to wait on a connect or read before giving up
 GB_2_IN_BYTES = 2 * 1024 * 1024 * 1024
+SOUNDGASM_RE = re.compile(SOUNDGASM_PATTERN)
+REDDIT_POST_RE = re.compile(REDDIT_POST_PATTERN)
+LINK_RE = re.compile(f"{SOUNDGASM_PATTERN}|{REDDIT_POST_PATTERN}")
+USERNAME_RE = re.compile(r'soundgasm\.net/u/([\w-]+)')
+INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+# fast path for soundgasm pages, matched against the raw response bytes
+# only the player's m4a: literal, a media link pasted into the description must not win
+M4A_RE = re.compile(rb'm4a:\s*"(https?://media\.soundgasm\.net/sounds/[a-zA-Z0-9]+\.m4a)"')
+M4A_TEXT_RE = re.compile(r'https?://media\.soundgasm\.net/sounds/[a-zA-Z0-9]+\.m4a')  # script text from the lxml fallback
+TITLE_RE = re.compile(rb'<h1[^>]*>([^<]+)</h1>')
+DESC_RE = re.compile(rb'<div[^>]*class="jp-description"[^>]*>(.*?)</div>', re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+H1_OPEN_RE = re.compile(rb'<h1\b', re.I)
+DIV_OPEN_RE = re.compile(rb'<div\b', re.I)
+DESCRIPTION_XPATH = '//div[contains(concat(" ", normalize-space(@class), " "), " jp-description ")]'
+M4A_SCRIPTS_XPATH = '//script[contains(text(), "m4a")]/text()'
 
 # initialize console once
 console = Console()
 
+def create_session(pool_size: int = POOL_SIZE, retries: bool = True) -> requests.Session:
+    """Create a keep-alive session for soundgasm and Pushshift requests."""
+    session = requests.Session()
+    session.headers["User-Agent"] = DEFAULT_USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=pool_size,
+        # praw does its own retrying and rate limiting, so its session opts out
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]) if retries else 0
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 class DownloadStats:
     def __init__(self):
         self.successful = 0
         self.failed = 0
         self.start_time = time.time()
         self.total_bytes = 0
-        self.lock = threading.Lock()
-        self.current_tasks = {}  # track active downloads
+        self.lock = threading.Lock()  # guards the counters only
+        self.current_tasks = {}  # track active downloads, single-key dict ops need no lock
+        self._changed = threading.Event()  # set whenever any of the above changes
 
     def add_success(self, bytes_downloaded: int):
         with self.lock:
             self.successful += 1
             self.total_bytes += bytes_downloaded
+        self._changed.set()
 
     def add_failure(self):
         with self.lock:
             self.failed += 1
+        self._changed.set()
 
     def get_average_speed(self) -> float:
         elapsed_time = time.time() - self.start_time
         return self.total_bytes / elapsed_time if elapsed_time > 0 else 0
 
     def add_task(self, task_id, title):
-        with self.lock:
-            self.current_tasks[task_id] = title
+        self.current_tasks[task_id] = title
+        self._changed.set()
 
     def remove_task(self, task_id):
-        with self.lock:
-            if task_id in self.current_tasks:
-                del self.current_tasks[task_id]
+        self.current_tasks.pop(task_id, None)
+        self._changed.set()
+
+    def active_titles(self) -> List[str]:
+        return list(self.current_tasks.values())
+
+    def wait_for_change(self, timeout: float) -> bool:
+        """Block until the stats change or the timeout passes, returning whether they changed."""
+        changed = self._changed.wait(timeout)
+        self._changed.clear()
+        return changed
 
 class Config:
     def __init__(self):
@@ -84,6 +139,9 @@ class Config:
         self.client_id = ""
         self.client_secret = ""
         self.verbose = False  # yaaaaaa no more mess
+        self.size_probe_workers = SIZE_PROBE_WORKERS
+        self.download_workers = MAX_WORKERS
+        self._saved_text = None  # what config.json currently holds, if known
         self.load_config()
         
         # check for credentials on the first run
@@ -96,12 +154,22 @@ class Config:
     def load_config(self):
         try:
             with open(CONFIG_PATH, "r") as f:
-                config = json.load(f)
+                self._saved_text = f.read()
+                config = json.loads(self._saved_text)
                 self.multithreaded = config.get("multithreaded", True)
                 self.size_warning = config.get("size_warning", True)
                 self.client_id = config.get("REDDIT_CLIENT_ID", "")
                 self.client_secret = config.get("REDDIT_CLIENT_SECRET", "")
                 self.verbose = config.get("verbose", False)  # load verbose setting
+                # a hand-edited 0 would leave the worker and buffer pools empty
+                try:
+                    self.size_probe_workers = max(1, int(config.get("size_probe_workers", SIZE_PROBE_WORKERS)))
+                except (TypeError, ValueError):
+                    self.size_probe_workers = SIZE_PROBE_WORKERS
+                try:
+                    self.download_workers = max(1, int(config.get("download_workers", MAX_WORKERS)))
+                except (TypeError, ValueError):
+                    self.download_workers = MAX_WORKERS
         except (FileNotFoundError, json.JSONDecodeError):
             self.save_config()
 
@@ -111,46 +179,106 @@ class Config:
             "size_warning": self.size_warning,
             "REDDIT_CLIENT_ID": self.client_id,
             "REDDIT_CLIENT_SECRET": self.client_secret,
-            "verbose": self.verbose  # save verbose setting
+            "verbose": self.verbose,  # save verbose setting
+            "size_probe_workers": self.size_probe_workers,
+            "download_workers": self.download_workers
         }
+        text = json.dumps(config, indent=4)
+        # nothing changed, leave the file alone
+        if text == self._saved_text:
+            return
         with open(CONFIG_PATH, "w") as f:
-            json.dump(config, f, indent=4)
+            f.write(text)
+        self._saved_text = text
 
 class SoundgasmDownloader:
-    def __init__(self, output_folder: str = DEFAULT_OUTPUT_FOLDER, config: Config = None):
+    def __init__(self, output_folder: str = DEFAULT_OUTPUT_FOLDER, config: Config = None, session: requests.Session = None):
         self.output_folder = output_folder
         os.makedirs(self.output_folder, exist_ok=True)
         self.stats = DownloadStats()
         self.config = config or Config()  # store config for verbosity control
+        # reuse connections across downloads
+        self.session = session or create_session(max(POOL_SIZE, self.config.download_workers))
+        # page metadata and audio sizes, shared by size probing and downloading
+        self._meta_cache: Dict[str, Tuple[str, str, Optional[str]]] = {}
+        self._meta_fetched: Dict[str, float] = {}  # when each page was fetched
+        self._size_cache: Dict[str, int] = {}
+        self._cache_lock = threading.Lock()
+        self._load_meta_cache()
+        # snapshot of each user folder's file names, so skips don't stat per link
+        self._existing: Dict[str, Set[str]] = {}
+        self._known_dirs: Set[str] = set()
+        # one download buffer per worker, reused across files
+        self._buffer_pool: queue.Queue = queue.Queue()
+        for _ in range(self.config.download_workers):
+            self._buffer_pool.put(bytearray(CHUNK_SIZE))
+        # tagging is disk work, so it runs as its own stage and frees download workers sooner
+        self._tag_executor = ThreadPoolExecutor(max_workers=TAG_WORKERS)
+        
+    def _extract_audio_metadata(self, content: bytes, url: str = None) -> Tuple[str, str, Optional[str]]:
+        m4a_match = M4A_RE.search(content)
+        title_match = TITLE_RE.search(content)
+        description_match = DESC_RE.search(content)
+        
+        # only a tag that is on the page but didn't match needs the full parser,
+        # a tag that isn't there at all is handled the same way the parser would
+        if (not title_match and H1_OPEN_RE.search(content)) or (not description_match and b'jp-description' in content):
+            return self._extract_metadata_from_tree(content, url)
+        # a media link outside the usual m4a: literal could still be in a script, let the parser look
+        if not m4a_match and b'media.soundgasm.net/sounds/' in content:
+            return self._extract_metadata_from_tree(content, url)
+        # TITLE_RE skips an <h1> holding markup and could land on a later one, the first <h1> is the title
+        if title_match and H1_OPEN_RE.search(content).start() != title_match.start():
+            return self._extract_metadata_from_tree(content, url)
+        # DESC_RE stops at the first </div>, so a nested div would cut the description short
+        if description_match and DIV_OPEN_RE.search(description_match.group(1)):
+            return self._extract_metadata_from_tree(content, url)
         
-    def _extract_audio_metadata(self, soup: BeautifulSoup, url: str = None) -> Tuple[str, str, Optional[str]]:
+        if title_match:
+            title = html.unescape(title_match.group(1).decode('utf-8', 'replace')).strip() or "unknown"
+        else:
+            title = self._title_from_url(url)
+        title = INVALID_FILENAME_RE.sub('', title)
+        
+        description = ''
+        if description_match:
+            # descriptions are usually wrapped in <p> tags, keep only the text
+            description = TAG_RE.sub('', description_match.group(1).decode('utf-8', 'replace'))
+            description = html.unescape(description).strip()
+        
+        m4a_link = m4a_match.group(1).decode('ascii') if m4a_match else None
+        return title, description, m4a_link
+    
+    def _title_from_url(self, url: str = None) -> str:
+        if not url:
+            return "unknown"
+        url_parts = url.split('/')
+        return url_parts[-1].replace('-', ' ') if url_parts else "unknown"
+    
+    def _extract_metadata_from_tree(self, content: bytes, url: str = None) -> Tuple[str, str, Optional[str]]:
         try:
+            tree = lxml_html.fromstring(content)
+            
             # get title (better error handling)
-            title_element = soup.find('h1')
-            if title_element:
-                title = title_element.text.strip()
+            title_element = tree.find('.//h1')
+            if title_element is not None:
+                title = title_element.text_content().strip()
             else:
                 # extract title from url as fallback
-                if url:
-                    url_parts = url.split('/')
-                    title = url_parts[-1].replace('-', ' ') if url_parts else "unknown"
-                else:
-                    title = "unknown"
+                title = self._title_from_url(url)
                 
             # fix title incase of invalid filename characters
-            title = re.sub(r'[<>:"/\\|?*]', '', title)
+            title = INVALID_FILENAME_RE.sub('', title)
         
             # get description (better error handling)
-            description_element = soup.find('div', class_='jp-description')
-            description = description_element.text.strip() if description_element else ''
+            description_elements = tree.xpath(DESCRIPTION_XPATH)
+            description = description_elements[0].text_content().strip() if description_elements else ''
         
-            # get m4a link
-            script_tags = soup.find_all('script')
-            for script in script_tags:
-                if script.string and 'm4a' in script.string:
-                    m4a_match = re.search(r'(https?://media\.soundgasm\.net/sounds/[a-zA-Z0-9]+\.m4a)', script.string)
-                    if m4a_match:
-                        return title, description, m4a_match.group(1)
+            # get m4a link, only looking at scripts that mention it
+            for script_text in tree.xpath(M4A_SCRIPTS_XPATH):
+                m4a_match = M4A_TEXT_RE.search(script_text)
+                if m4a_match:
+                    return title, description, m4a_match.group(0)
         
             return title, description, None
         except Exception as e:
@@ -159,18 +287,132 @@ class SoundgasmDownloader:
             # return safe fallback values
             return "unknown", "", None
     
+    def _get_meta(self, url: str) -> Tuple[str, str, Optional[str]]:
+        """Fetch and parse a soundgasm page once, then serve it from the cache."""
+        with self._cache_lock:
+            if url in self._meta_cache:
+                return self._meta_cache[url]
+        
+        response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        meta = self._extract_audio_metadata(response.content, url)
+        
+        with self._cache_lock:
+            self._meta_cache[url] = meta
+            self._meta_fetched[url] = time.time()
+        return meta
+    
+    def _load_meta_cache(self) -> None:
+        """Pick up pages fetched by earlier runs, so reruns skip straight to the audio."""
+        try:
+            with open(META_CACHE_PATH, "r") as f:
+                entries = json.load(f)
+            items = entries.items()
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return
+        
+        now = time.time()
+        for url, entry in items:
+            # a damaged entry is just refetched rather than breaking every run
+            try:
+                if now - entry.get("fetched", 0) < META_CACHE_TTL:
+                    self._meta_cache[url] = (entry["title"], entry["description"], entry["m4a_link"])
+                    self._meta_fetched[url] = entry["fetched"]
+            except (AttributeError, KeyError, TypeError):
+                continue
+    
+    def save_meta_cache(self) -> None:
+        with self._cache_lock:
+            # pages without audio may just have failed to parse, so try those again next run
+            entries = {
+                url: {"title": title, "description": description, "m4a_link": m4a_link, "fetched": self._meta_fetched[url]}
+                for url, (title, description, m4a_link) in self._meta_cache.items()
+                if m4a_link
+            }
+        # write aside and swap in, so an interrupted save can't leave a half-written cache
+        temp_path = META_CACHE_PATH + ".part"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, META_CACHE_PATH)
+        except OSError as e:
+            if self.config.verbose:
+                console.print(f"[yellow]Warning: Could not save page cache: {e}")
+    
+    def _prefetch_one(self, url: str) -> None:
+        try:
+            self._get_meta(url)
+        except Exception as e:
+            # not cached, so download_audio will retry and report it
+            if self.config.verbose:
+                console.print(f"[red]Error fetching {url}: {str(e)}")
+    
+    def prefetch_meta(self, links: List[str]) -> None:
+        """Fetch and parse every page up front so later stages only read the cache."""
+        with console.status("[cyan]Fetching audio pages...", spinner="dots"):
+            with ThreadPoolExecutor(max_workers=self.config.size_probe_workers) as executor:
+                list(executor.map(self._prefetch_one, links))
+        self.save_meta_cache()
+    
+    def _get_content_length(self, m4a_link: str) -> int:
+        """HEAD an audio file once for its size."""
+        with self._cache_lock:
+            if m4a_link in self._size_cache:
+                return self._size_cache[m4a_link]
+        
+        # headers are all we need, no body
+        head = self.session.head(m4a_link, allow_redirects=True, timeout=REQUEST_TIMEOUT)
+        size = int(head.headers.get('content-length', 0))
+        
+        with self._cache_lock:
+            self._size_cache[m4a_link] = size
+        return size
+    
+    def _existing_files(self, username: str) -> Set[str]:
+        """List a user folder once and remember what is already downloaded."""
+        with self._cache_lock:
+            if username not in self._existing:
+                try:
+                    self._existing[username] = set(os.listdir(os.path.join(self.output_folder, username)))
+                except FileNotFoundError:
+                    self._existing[username] = set()
+            return self._existing[username]
+    
+    def _ensure_user_folder(self, username: str) -> str:
+        """Create a user folder the first time it is needed and return its path."""
+        user_folder = os.path.join(self.output_folder, username)
+        with self._cache_lock:
+            if user_folder not in self._known_dirs:
+                os.makedirs(user_folder, exist_ok=True)
+                self._known_dirs.add(user_folder)
+        return user_folder
+    
+    def _is_downloaded(self, username: str, file_name: str) -> bool:
+        existing = self._existing_files(username)
+        with self._cache_lock:
+            return file_name in existing
+    
+    def _mark_downloaded(self, username: str, file_name: str) -> None:
+        existing = self._existing_files(username)
+        with self._cache_lock:
+            existing.add(file_name)
+    
+    def _unmark_downloaded(self, username: str, file_name: str) -> None:
+        existing = self._existing_files(username)
+        with self._cache_lock:
+            existing.discard(file_name)
+    
     def download_audio(self, url: str, progress: Progress, overall_task_id: int, reddit_username: str = None) -> None:
         global terminate_flag
+        response = None
+        buffer = None
+        partial_path = None  # set while a file on disk is incomplete
         try:
             # get the page content without creating a status task
             if self.config.verbose:
                 console.print(f"[cyan]Fetching {url}")
             
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            title, description, m4a_link = self._extract_audio_metadata(soup, url)
+            title, description, m4a_link = self._get_meta(url)
             
             if not m4a_link:
                 console.print(f"[red]No audio link found for {url}")
@@ -178,27 +420,27 @@ class SoundgasmDownloader:
                 return
 
             # extract soundgasm username
-            soundgasm_username = re.search(r'soundgasm\.net/u/([\w-]+)', url)
-            if soundgasm_username:
-                username = soundgasm_username.group(1)
-            else:
-                username = "unknown"
+            username = extract_username_from_soundgasm_url(url)
             
             # create user-specific folder
-            user_folder = os.path.join(self.output_folder, username)
-            os.makedirs(user_folder, exist_ok=True)
+            user_folder = self._ensure_user_folder(username)
             
             file_extension = os.path.splitext(m4a_link)[-1]
-            file_path = os.path.join(user_folder, f"{title}{file_extension}")
+            file_name = f"{title}{file_extension}"
+            file_path = os.path.join(user_folder, file_name)
             
             # check if file already exists
-            if os.path.exists(file_path):
+            if self._is_downloaded(username, file_name):
                 if self.config.verbose:
                     console.print(f"[yellow]Skipping: {title} (already exists)")
                 return
             
-            response = requests.get(m4a_link, stream=True)
-            total_size = int(response.headers.get('content-length', 0))
+            response = self.session.get(m4a_link, stream=True, timeout=REQUEST_TIMEOUT)
+            # don't save an error page as audio
+            response.raise_for_status()
+            response.raw.decode_content = True
+            content_length = int(response.headers.get('content-length', 0))
+            total_size = content_length or self._size_cache.get(m4a_link, 0)
             
             download_task = progress.add_task(
                 description=f"[magenta]{title}",
@@ -210,8 +452,23 @@ class SoundgasmDownloader:
             self.stats.add_task(download_task, title)
             
             bytes_downloaded = 0
-            with open(file_path, 'wb') as file:
-                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            pending_bytes = 0  # downloaded but not yet shown on the progress bars
+            last_update = time.monotonic()
+            buffer = self._buffer_pool.get()
+            view = memoryview(buffer)
+            self._mark_downloaded(username, file_name)
+            # write under a temporary name so a crash never leaves a truncated file under the real one
+            partial_path = file_path + ".part"
+            # chunks are already large, so write them straight to the fd without an extra buffer copy
+            with open(partial_path, 'wb', buffering=0) as file:
+                if content_length and hasattr(os, 'posix_fallocate'):
+                    try:
+                        # reserve the space up front, fewer extent updates while writing
+                        os.posix_fallocate(file.fileno(), 0, content_length)
+                    except OSError:
+                        pass  # filesystem doesn't support it, just write normally
+                
+                while True:
                     if terminate_flag:
                         # close file and clean up on abort
                         if self.config.verbose:
@@ -219,25 +476,39 @@ class SoundgasmDownloader:
                         progress.remove_task(download_task)
                         self.stats.remove_task(download_task)
                         return
-                        
-                    size = file.write(chunk)
+                    
+                    size = response.raw.readinto(buffer)
+                    if not size:
+                        break
+                    written = 0
+                    while written < size:  # unbuffered writes can come up short
+                        written += file.write(view[written:size])
                     bytes_downloaded += size
-                    progress.update(download_task, advance=size)
-                    progress.update(overall_task_id, advance=size)
-            
-            # add metadata quietly - no console output unless the users a masochist (verbose)
-            audio = EasyMP4(file_path)
-            audio['title'] = title
-            audio['comment'] = description
-            audio['artist'] = username
-            audio.save()
+                    pending_bytes += size
+                    
+                    now = time.monotonic()
+                    if now - last_update >= PROGRESS_UPDATE_INTERVAL:
+                        progress.update(download_task, completed=bytes_downloaded)
+                        progress.update(overall_task_id, advance=pending_bytes)
+                        pending_bytes = 0
+                        last_update = now
+                
+                # a body cut short is not a finished file, fail so the .part is removed
+                if content_length and bytes_downloaded < content_length:
+                    raise IOError(f"incomplete download: got {bytes_downloaded} of {content_length} bytes")
+                # the body ran past the reserved space, make sure the size matches what was written
+                if content_length and bytes_downloaded > content_length:
+                    file.truncate(bytes_downloaded)
             
-            if self.config.verbose:
-                console.print(f"[green]Completed: {title}")
+            os.replace(partial_path, file_path)
+            partial_path = None
+            if pending_bytes:
+                progress.update(download_task, completed=bytes_downloaded)
+                progress.update(overall_task_id, advance=pending_bytes)
             
             progress.remove_task(download_task)
             self.stats.remove_task(download_task)
-            self.stats.add_success(bytes_downloaded)
+            self._tag_executor.submit(self._tag_audio, file_path, title, description, username, bytes_downloaded)
             
         except Exception as e:
             console.print(f"[red]Error with {url}: {str(e)}")
@@ -245,44 +516,136 @@ class SoundgasmDownloader:
             if 'download_task' in locals():
                 progress.remove_task(download_task)
                 self.stats.remove_task(download_task)
+        finally:
+            # hand the connection back to the pool
+            if response is not None:
+                response.close()
+            if buffer is not None:
+                self._buffer_pool.put(buffer)
+            # never leave a half-written file behind to be skipped as done next time
+            if partial_path is not None:
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+                self._unmark_downloaded(username, file_name)
+
+    def _tag_audio(self, file_path: str, title: str, description: str, username: str, bytes_downloaded: int) -> None:
+        try:
+            # add metadata quietly - no console output unless the users a masochist (verbose)
+            audio = MP4(file_path)
+            if audio.tags is None:
+                audio.add_tags()
+            audio.tags['\xa9nam'] = [title]
+            audio.tags['\xa9cmt'] = [description]
+            audio.tags['\xa9ART'] = [username]
+            audio.save(padding=lambda info: TAG_PADDING)
+        except Exception as e:
+            console.print(f"[red]Error tagging {title}: {str(e)}")
+            self.stats.add_failure()
+            return
+        
+        if self.config.verbose:
+            console.print(f"[green]Completed: {title}")
+        self.stats.add_success(bytes_downloaded)
+    
+    def wait_for_tagging(self) -> None:
+        """Block until every downloaded file has been tagged."""
+        with console.status("[cyan]Tagging downloaded files...", spinner="dots"):
+            self._tag_executor.shutdown(wait=True)
 
 class RedditScraper:
-    def __init__(self, config: Config):
+    # praw clients by credentials, kept across scrapers so the oauth token survives between runs
+    _reddit_clients: Dict[Tuple[str, str], praw.Reddit] = {}
+    _reddit_lock = threading.Lock()
+
+    def __init__(self, config: Config, session: requests.Session = None):
         self.config = config
-        self.reddit = praw.Reddit(
-            client_id=self.config.client_id,
-            client_secret=self.config.client_secret,
-            user_agent=DEFAULT_USER_AGENT
-        )
+        self.session = session or create_session()
+        self.reddit = self._get_reddit(self.config)
+        self._links_cache: Dict[str, Set[str]] = {}
+    
+    @classmethod
+    def _get_reddit(cls, config: Config) -> praw.Reddit:
+        key = (config.client_id, config.client_secret)
+        with cls._reddit_lock:
+            if key not in cls._reddit_clients:
+                cls._reddit_clients[key] = praw.Reddit(
+                    client_id=config.client_id,
+                    client_secret=config.client_secret,
+                    user_agent=DEFAULT_USER_AGENT,
+                    # pooled like ours, but separate so praw's user agent and retries stay its own
+                    requestor_kwargs={"session": create_session(retries=False)}
+                )
+            return cls._reddit_clients[key]
+    
+    def _fetch_pushshift(self, username: str) -> Set[str]:
+        soundgasm_links: Set[str] = set()
+        before = None
+        try:
+            # page backwards through the author's history until it runs out
+            while True:
+                pushshift_url = f"https://api.pushshift.io/reddit/search/submission/?author={username}&limit={PUSHSHIFT_PAGE_SIZE}&sort=desc"
+                if before is not None:
+                    pushshift_url += f"&before={before}"
+                response = self.session.get(pushshift_url, timeout=REQUEST_TIMEOUT)
+                if response.status_code != 200:
+                    break
+                
+                data = response.json().get("data", [])
+                for post in data:
+                    for field in (post.get("selftext") or "", post.get("title") or ""):
+                        soundgasm_links.update(match.group(0) for match in SOUNDGASM_RE.finditer(field))
+                
+                if len(data) < PUSHSHIFT_PAGE_SIZE or "created_utc" not in data[-1]:
+                    break
+                # stop if the cursor didn't move back, or an ignored before= would loop forever
+                oldest = data[-1]["created_utc"]
+                if before is not None and oldest >= before:
+                    break
+                before = oldest
+        except Exception as e:
+            if self.config.verbose:
+                console.print(f"[yellow]Warning: Error fetching Pushshift data: {e}")
+        return soundgasm_links
+    
+    def _fetch_praw(self, username: str) -> Set[str]:
+        soundgasm_links: Set[str] = set()
+        try:
+            user = self.reddit.redditor(username)
+            for post in user.submissions.new(limit=1000):
+                for field in (post.selftext, post.title):
+                    soundgasm_links.update(match.group(0) for match in SOUNDGASM_RE.finditer(field))
+                
+                if "soundgasm.net" in post.url:
+                    soundgasm_links.add(post.url)
+        except Exception as e:
+            console.print(f"[red]Error fetching Reddit posts: {e}")
+        return soundgasm_links
+    
+    def _collect_links(self, username: str) -> Set[str]:
+        # neither source depends on the other, so query both at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pushshift_future = executor.submit(self._fetch_pushshift, username)
+            praw_future = executor.submit(self._fetch_praw, username)
+            return pushshift_future.result() | praw_future.result()
+    
+    def prefetch_links(self, usernames: List[str]) -> None:
+        """Scrape several profiles at once so get_soundgasm_links can answer from the cache."""
+        with console.status(f"[cyan]Fetching posts from {len(usernames)} profiles...", spinner="dots"):
+            # pushshift is plain http and fans out fine, but a praw client isn't thread-safe,
+            # so reddit is walked one profile at a time while pushshift runs in the background
+            with ThreadPoolExecutor(max_workers=min(len(usernames), PUSHSHIFT_WORKERS)) as executor:
+                pushshift_futures = {username: executor.submit(self._fetch_pushshift, username) for username in usernames}
+                for username in pushshift_futures:
+                    praw_links = self._fetch_praw(username)
+                    self._links_cache[username] = pushshift_futures[username].result() | praw_links
     
     def get_soundgasm_links(self, username: str) -> List[str]:
-        with console.status(f"[cyan]Fetching posts from u/{username}...", spinner="dots"):
-            soundgasm_links: Set[str] = set()
-            
-            try:
-                pushshift_url = f"https://api.pushshift.io/reddit/search/submission/?author={username}&limit=1000"
-                response = requests.get(pushshift_url)
-                if response.status_code == 200:
-                    data = response.json().get("data", [])
-                    for post in data:
-                        text = post.get("selftext", "") + " " + post.get("title", "")
-                        matches = re.findall(SOUNDGASM_PATTERN, text)
-                        soundgasm_links.update(matches)
-            except Exception as e:
-                if self.config.verbose:
-                    console.print(f"[yellow]Warning: Error fetching Pushshift data: {e}")
-
-            try:
-                user = self.reddit.redditor(username)
-                for post in user.submissions.new(limit=1000):
-                    text = post.selftext + " " + post.title
-                    matches = re.findall(SOUNDGASM_PATTERN, text)
-                    soundgasm_links.update(matches)
-                    
-                    if "soundgasm.net" in post.url:
-                        soundgasm_links.add(post.url)
-            except Exception as e:
-                console.print(f"[red]Error fetching Reddit posts: {e}")
+        soundgasm_links = self._links_cache.pop(username, None)
+        if soundgasm_links is None:
+            with console.status(f"[cyan]Fetching posts from u/{username}...", spinner="dots"):
+                soundgasm_links = self._collect_links(username)
 
         console.print(f"[green]Found {len(soundgasm_links)} soundgasm links for u/{username}.")
         return list(soundgasm_links)
@@ -293,9 +656,10 @@ def show_options_menu(config: Config):
         console.print(f"1. Multi-threaded downloads: {'[green]Enabled[/]' if config.multithreaded else '[red]Disabled[/]'}")
         console.print(f"2. 2GB size warning: {'[green]Enabled[/]' if config.size_warning else '[red]Disabled[/]'}")
         console.print(f"3. Verbose output: {'[green]Enabled[/]' if config.verbose else '[red]Disabled[/]'}")
-        console.print("4. Back to main menu")
+        console.print(f"4. Concurrent downloads: [cyan]{config.download_workers}[/]")
+        console.print("5. Back to main menu")
         
-        choice = IntPrompt.ask("Select option", choices=["1", "2", "3", "4"])
+        choice = IntPrompt.ask("Select option", choices=["1", "2", "3", "4", "5"])
         
         if choice == 1:
             config.multithreaded = not config.multithreaded
@@ -304,37 +668,39 @@ def show_options_menu(config: Config):
         elif choice == 3:
             config.verbose = not config.verbose
         elif choice == 4:
+            workers = IntPrompt.ask("Number of concurrent downloads", default=config.download_workers)
+            config.download_workers = max(1, workers)
+        elif choice == 5:
             config.save_config()
             break
 
+def _probe_link_size(link: str, downloader: SoundgasmDownloader) -> int:
+    """Return the download size of a single link, or 0 if it is skipped or fails."""
+    try:
+        title, _, m4a_link = downloader._get_meta(link)
+        
+        # extract username and check if file exists
+        username = extract_username_from_soundgasm_url(link)
+        
+        file_extension = os.path.splitext(m4a_link)[-1] if m4a_link else ".m4a"
+        
+        # yucky duplicates
+        if downloader._is_downloaded(username, f"{title}{file_extension}"):
+            return 0
+        
+        if m4a_link:
+            return downloader._get_content_length(m4a_link)
+    except Exception as e:
+        if downloader.config.verbose:
+            console.print(f"[red]Error calculating size for {link}: {str(e)}")
+    return 0
+
 def calculate_total_size(links: List[str], downloader: SoundgasmDownloader) -> int:
-    total_size = 0
     with console.status("[cyan]Calculating total download size...", spinner="dots"):
-        for link in links:
-            try:
-                response = requests.get(link)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                title, _, m4a_link = downloader._extract_audio_metadata(soup, link)
-                
-                # extract username and check if file exists
-                soundgasm_username = re.search(r'soundgasm\.net/u/([\w-]+)', link)
-                username = soundgasm_username.group(1) if soundgasm_username else "unknown"
-                
-                file_extension = os.path.splitext(m4a_link)[-1] if m4a_link else ".m4a"
-                file_path = os.path.join(downloader.output_folder, username, f"{title}{file_extension}")
-                
-                # yucky duplicates
-                if os.path.exists(file_path):
-                    continue
-                
-                if m4a_link:
-                    response = requests.get(m4a_link, stream=True)
-                    total_size += int(response.headers.get('content-length', 0))
-            except Exception as e:
-                if downloader.config.verbose:
-                    console.print(f"[red]Error calculating size for {link}: {str(e)}")
-                continue
-    return total_size
+        # probing is pure network wait, so fan it out
+        with ThreadPoolExecutor(max_workers=downloader.config.size_probe_workers) as executor:
+            sizes = list(executor.map(lambda link: _probe_link_size(link, downloader), links))
+    return sum(sizes)
 
 def format_speed(bytes_per_second: float) -> str:
     if bytes_per_second >= 1024 * 1024:
@@ -344,7 +710,7 @@ def format_speed(bytes_per_second: float) -> str:
     else:
         return f"{bytes_per_second:.2f} B/s"
 
-def create_progress_bar(console: Console) -> Progress:
+def create_progress_bar(console: Console, config: Config) -> Progress:
     """Create a configured progress bar instance"""
     return Progress(
         SpinnerColumn(),
@@ -355,16 +721,40 @@ def create_progress_bar(console: Console) -> Progress:
         TimeRemainingColumn(),
         console=console,
         expand=True,
-        transient=not Config().verbose
+        transient=not config.verbose
     )
 
-def download_for_user(username: str, scraper: RedditScraper, config: Config, downloader: SoundgasmDownloader, show_threading_warning: bool = True) -> None:
+def download_with_executor(executor: ThreadPoolExecutor, jobs: List[Tuple[str, str]], downloader: SoundgasmDownloader, progress: Progress, overall_task: int, config: Config) -> None:
+    """Run (link, username) downloads on an existing executor and wait for them."""
+    futures = []
+    for link, username in jobs:
+        if terminate_flag:
+            break
+        futures.append(executor.submit(downloader.download_audio, link, progress, overall_task, username))
+    
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except Exception as e:
+            if config.verbose:
+                console.print(f"[red]Error in thread: {str(e)}")
+        
+        # check termination flag after each completed download
+        if terminate_flag:
+            console.print("[yellow]Aborting remaining downloads...")
+            for f in futures:
+                if not f.done():
+                    f.cancel()
+            break
+
+def download_for_user(username: str, scraper: RedditScraper, config: Config, downloader: SoundgasmDownloader, show_threading_warning: bool = True, executor: Optional[ThreadPoolExecutor] = None) -> None:
     global terminate_flag
     links = scraper.get_soundgasm_links(username)
     if not links:
         console.print(f"[yellow]No valid soundgasm links found for u/{username}.")
         return
 
+    downloader.prefetch_meta(links)
     total_size = calculate_total_size(links, downloader)
     
     if config.size_warning and total_size > GB_2_IN_BYTES:
@@ -379,7 +769,7 @@ def download_for_user(username: str, scraper: RedditScraper, config: Config, dow
             console.print("[cyan]Switching to single-threaded mode for stability.")
             use_multithreaded = False
 
-    progress = create_progress_bar(console)
+    progress = create_progress_bar(console, config)
     with progress:
         overall_task = progress.add_task(
             f"[yellow]Overall Progress for u/{username}",
@@ -387,27 +777,12 @@ def download_for_user(username: str, scraper: RedditScraper, config: Config, dow
         )
         
         if use_multithreaded:
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                futures = []
-                for link in links:
-                    if terminate_flag:
-                        break
-                    futures.append(executor.submit(downloader.download_audio, link, progress, overall_task, username))
-                
-                for future in as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as e:
-                        if config.verbose:
-                            console.print(f"[red]Error in thread: {str(e)}")
-                    
-                    # check termination flag after each completed download
-                    if terminate_flag:
-                        console.print("[yellow]Aborting remaining downloads...")
-                        for f in futures:
-                            if not f.done():
-                                f.cancel()
-                        break
+            jobs = [(link, username) for link in links]
+            if executor is not None:
+                download_with_executor(executor, jobs, downloader, progress, overall_task, config)
+            else:
+                with ThreadPoolExecutor(max_workers=config.download_workers) as own_executor:
+                    download_with_executor(own_executor, jobs, downloader, progress, overall_task, config)
         else:
             for link in links:
                 if terminate_flag:
@@ -417,45 +792,43 @@ def download_for_user(username: str, scraper: RedditScraper, config: Config, dow
 
 def extract_links_from_text(text: str) -> List[str]:
     """Extract soundgasm links from text input."""
-    return re.findall(SOUNDGASM_PATTERN, text)
+    return SOUNDGASM_RE.findall(text)
+
+def count_lines_without_links(text: str) -> int:
+    """Count non-empty input lines that held neither a soundgasm link nor a Reddit post."""
+    # one sweep over the whole text, keyed by the newline that starts each matching line
+    lines_with_links = {text.rfind('\n', 0, match.start()) for match in LINK_RE.finditer(text)}
+    non_empty_lines = sum(1 for line in text.split('\n') if line.strip())
+    return non_empty_lines - len(lines_with_links)
 
 def extract_links_from_reddit_post(url: str, reddit: praw.Reddit) -> List[str]:
     """Extract soundgasm links from a Reddit post URL."""
     try:
         submission = reddit.submission(url=url)
-        text = f"{submission.title} {submission.selftext}"
-        for comment in submission.comments.list():
-            if isinstance(comment, praw.models.Comment):
-                text += f" {comment.body}"
-        return extract_links_from_text(text)
+        # drop unexpanded "load more comments" stubs rather than fetching them
+        submission.comments.replace_more(limit=0)
+        parts = [submission.title, submission.selftext]
+        parts.extend(comment.body for comment in submission.comments.list() if isinstance(comment, praw.models.Comment))
+        return list(set(extract_links_from_text(" ".join(parts))))
     except Exception as e:
         console.print(f"[red]Error processing Reddit post {url}: {str(e)}")
         return []
 
 def process_input_links(text: str, reddit: praw.Reddit) -> List[str]:
     """Process input text to extract both direct soundgasm links and links from Reddit posts."""
-    links = set()
-    
-    # split input by lines or spaces
-    items = re.split(r'[\n\s]+', text.strip())
+    # direct soundgasm link thingies, found in one pass over the whole input
+    # (dicts dedupe like a set but keep the order the links were pasted in)
+    links = dict.fromkeys(SOUNDGASM_RE.findall(text))
     
-    for item in items:
-        if not item:
-            continue
-            
-        # check if its a reddit post thingy
-        if re.match(REDDIT_POST_PATTERN, item):
-            reddit_links = extract_links_from_reddit_post(item, reddit)
-            links.update(reddit_links)
-        # check if its a direct soundgasm link thingy
-        elif re.match(SOUNDGASM_PATTERN, item):
-            links.add(item)
+    # reddit post thingies, each one fetched only once
+    for post_url in dict.fromkeys(REDDIT_POST_RE.findall(text)):
+        links.update(dict.fromkeys(extract_links_from_reddit_post(post_url, reddit)))
             
     return list(links)
 
 def extract_username_from_soundgasm_url(url: str) -> str:
     """Extract username from a soundgasm URL."""
-    match = re.search(r'soundgasm\.net/u/([\w-]+)', url)
+    match = USERNAME_RE.search(url)
     return match.group(1) if match else "unknown"
 
 def read_links_from_file(file_path: str) -> str:
@@ -477,11 +850,14 @@ def handle_manual_input(config: Config, downloader: SoundgasmDownloader):
     
     text = ""
     if input_choice == 1:
-        console.print("\n[cyan]Enter Soundgasm links or Reddit post URLs (one per line, press Enter twice to finish):")
+        console.print("\n[cyan]Enter Soundgasm links or Reddit post URLs (one per line, press Enter twice or Ctrl-D to finish):")
         lines = []
         
         while True:
-            line = input()
+            try:
+                line = input()
+            except EOFError:
+                break
             if not line:
                 if lines:
                     break
@@ -489,11 +865,10 @@ def handle_manual_input(config: Config, downloader: SoundgasmDownloader):
                     continue
             lines.append(line)
         
-        if not lines:
+        text = "\n".join(lines)
+        if not text.strip():
             console.print("[yellow]No input provided.")
             return
-            
-        text = "\n".join(lines)
     else:  # input_choice == 2
         file_path = Prompt.ask("\n[cyan]Enter the path to your text file (with one link per line)")
         text = read_links_from_file(file_path)
@@ -501,9 +876,13 @@ def handle_manual_input(config: Config, downloader: SoundgasmDownloader):
             console.print("[yellow]No valid content found in the file.")
             return
     
-    scraper = RedditScraper(config)
+    scraper = RedditScraper(config, downloader.session)
     links = process_input_links(text, scraper.reddit)
     
+    skipped = count_lines_without_links(text)
+    if skipped:
+        console.print(f"[yellow]Skipped {skipped} line(s) without a soundgasm link or Reddit post.")
+    
     if not links:
         console.print("[yellow]No valid soundgasm links found.")
         return
@@ -519,6 +898,7 @@ def handle_manual_input(config: Config, downloader: SoundgasmDownloader):
         links_by_username[username].append(link)
     
     # calculate total size and ball
+    downloader.prefetch_meta(links)
     total_size = calculate_total_size(links, downloader)
     
     if config.size_warning and total_size > GB_2_IN_BYTES:
@@ -528,29 +908,25 @@ def handle_manual_input(config: Config, downloader: SoundgasmDownloader):
     # nuh
     use_multithreaded = config.multithreaded
     
-    progress = create_progress_bar(console)
+    progress = create_progress_bar(console, config)
     with progress:
         overall_task = progress.add_task(
             "[yellow]Overall Progress",
             total=total_size
         )
         
-        for username, user_links in links_by_username.items():
-            console.print(f"\n[cyan]Downloading files for user: {username}")
+        if use_multithreaded:
+            # one pool for every user instead of spinning one up per user
+            jobs = []
+            for username, user_links in links_by_username.items():
+                jobs.extend((link, username) for link in user_links)
+            console.print(f"\n[cyan]Downloading {len(jobs)} files from {len(links_by_username)} users")
             
-            if use_multithreaded:
-                with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                    futures = [
-                        executor.submit(downloader.download_audio, link, progress, overall_task, username)
-                        for link in user_links
-                    ]
-                    for future in as_completed(futures):
-                        try:
-                            future.result()
-                        except Exception as e:
-                            if config.verbose:
-                                console.print(f"[red]Error in thread: {str(e)}")
-            else:
+            with ThreadPoolExecutor(max_workers=config.download_workers) as executor:
+                download_with_executor(executor, jobs, downloader, progress, overall_task, config)
+        else:
+            for username, user_links in links_by_username.items():
+                console.print(f"\n[cyan]Downloading files for user: {username}")
                 for link in user_links:
                     downloader.download_audio(link, progress, overall_task, username)
 
@@ -561,15 +937,18 @@ def signal_handler(sig, frame):
 
 def show_active_downloads(downloader: SoundgasmDownloader):
     """Display active downloads in a continuously updating view"""
-    with Live(auto_refresh=True) as live:
+    with Live(auto_refresh=False) as live:
+        changed = True
         while True:
-            tasks = list(downloader.stats.current_tasks.values())
-            if not tasks:
-                live.update("No active downloads")
-            else:
-                task_list = "\n".join([f"• {task}" for task in tasks])
-                live.update(f"Active downloads ({len(tasks)}):\n{task_list}")
-            time.sleep(0.5)
+            # only rerender when a download starts or finishes
+            if changed:
+                tasks = downloader.stats.active_titles()
+                if not tasks:
+                    live.update("No active downloads", refresh=True)
+                else:
+                    task_list = "\n".join([f"• {task}" for task in tasks])
+                    live.update(f"Active downloads ({len(tasks)}):\n{task_list}", refresh=True)
+            changed = downloader.stats.wait_for_change(timeout=2.0)
 
 def main():
     global terminate_flag
@@ -615,21 +994,25 @@ def main():
                 console.print("[yellow]No usernames entered.")
                 continue
                 
-            scraper = RedditScraper(config)
+            scraper = RedditScraper(config, downloader.session)
             
             # show threading warning only once if multiple usernames
             show_warning = len(usernames) > 1
+            if len(usernames) > 1:
+                scraper.prefetch_links(usernames)
             
-            # process each username
-            for i, username in enumerate(usernames):
-                # only show the warning for the first username if multiple usernames are used
-                download_for_user(username, scraper, config, downloader, show_warning and i == 0)
+            # process each username, reusing the same worker threads for all of them
+            with ThreadPoolExecutor(max_workers=config.download_workers) as executor:
+                for i, username in enumerate(usernames):
+                    # only show the warning for the first username if multiple usernames are used
+                    download_for_user(username, scraper, config, downloader, show_warning and i == 0, executor)
         
         elif mode == 2:
             handle_manual_input(config, downloader)
             
         # statistics
         if mode in (1, 2):
+            downloader.wait_for_tagging()
             console.print("\n[green]All downloads completed!")
             console.print(f"Successfully downloaded: [green]{downloader.stats.successful}[/] files")
             console.print(f"Failed downloads: [red]{downloader.stats.failed}[/] files")